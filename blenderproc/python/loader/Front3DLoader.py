@@ -4,23 +4,22 @@ import json
 import os
 import warnings
 from math import radians
-from typing import List, Mapping
+from typing import Dict, List, Mapping
 from urllib.request import urlretrieve
 
 import bpy
 import mathutils
 import numpy as np
 import trimesh
-from mathutils import Vector, Matrix
 
 from blenderproc.python.material import MaterialLoaderUtility
 from blenderproc.python.utility.LabelIdMapping import LabelIdMapping
 from blenderproc.python.utility.CollisionUtility import CollisionUtility
-from blenderproc.python.types.MeshObjectUtility import MeshObject, create_with_empty_mesh, get_all_mesh_objects
+from blenderproc.python.types.MeshObjectUtility import MeshObject, create_with_empty_mesh
+from blenderproc.python.types.EntityUtility import delete_multiple
 from blenderproc.python.utility.Utility import resolve_path
 from blenderproc.python.loader.ObjectLoader import load_obj
 from blenderproc.python.loader.TextureLoader import load_texture
-from blenderproc.python.filter.Filter import one_by_attr
 
 
 
@@ -540,10 +539,14 @@ class _Front3DLoader:
         :return: The list of loaded mesh objects.
         """
         # this rotation matrix rotates the given quaternion into the blender coordinate system
-        blender_rot_mat = mathutils.Matrix.Rotation(radians(-90), 4, 'X')
+        blender_rot_mat = mathutils.Matrix.Rotation(radians(-90), 3, 'X')
         created_objects = []
         collision_objects = []
         bvh_cache: Dict[str, mathutils.bvhtree.BVHTree] = {}
+        # the ABO objects are the ones loaded from .glb files
+        abo_uids = {ele["uid"] for ele in data["furniture"] if ele["jid"].lower().endswith(".glb")}
+        # the loaded furniture objects which have been placed in a room, all others are removed at the end
+        placed_furniture = set()
         # for each room
         for room_id, room in enumerate(data["scene"]["room"]):
             # for each object in that room
@@ -553,6 +556,20 @@ class _Front3DLoader:
                     # value count is used to find the parent of meshs 
                     count = 0
                     parent = ''
+                    is_abo = child["ref"] in abo_uids
+                    # extract the quaternion and convert it to a rotation matrix, then transform it into the
+                    # blender coordinate system and then to an euler
+                    euler = (blender_rot_mat @ mathutils.Quaternion(child["rot"]).to_matrix()).to_euler()
+                    if is_abo:
+                        euler[0] = 0
+                    # this flips the y and z coordinate to bring it to the blender coordinate system,
+                    # the object is also lowered slightly (without changing the json data)
+                    pos = child["pos"]
+                    # the whole pose is set at once instead of setting location, rotation and scale separately
+                    local2world = mathutils.Matrix.LocRotScale((pos[0], pos[2], pos[1] - 0.00005), euler,
+                                                               child["scale"])
+                    # the scale is right like this, and you nedd to use it after ...
+                    # mathutils.Vector(child["scale"]).xzy
                     for obj in all_loaded_furniture:
                         if obj.get_cp("uid") == child["ref"]:
                             # if the object was used before, duplicate the object and move that duplicated obj
@@ -574,38 +591,24 @@ class _Front3DLoader:
                             else:
                                 # if it is the first time use the object directly
                                 new_obj = obj
+                                placed_furniture.add(obj)
 
-                            if(new_obj.has_cp("is_ABO") == True):
+                            if is_abo:
                                 bbox = new_obj.get_bound_box()
                                 new_obj.set_origin((bbox[0] + bbox[7]) / 2)
 
                             created_objects.append(new_obj)
-                            new_obj.set_cp("is_used", True)
-                            new_obj.set_cp("room_id", room_id)
-                            new_obj.set_cp("3D_future_type", "Object")  # is an object used for the interesting score
-                            new_obj.set_cp("coarse_grained_class", new_obj.get_cp("category_id"))
+                            # write the custom properties directly, none of them is keyframed or a blender attribute
+                            blender_obj = new_obj.blender_obj
+                            blender_obj["is_used"] = True
+                            blender_obj["room_id"] = room_id
+                            blender_obj["3D_future_type"] = "Object"  # is an object used for the interesting score
+                            blender_obj["coarse_grained_class"] = blender_obj["category_id"]
                             # this used to move thing munnully
-                            new_obj.set_cp("instanceid", child['instanceid'])
-                            # this flips the y and z coordinate to bring it to the blender coordinate system
-                            child["pos"][1] += -0.00005
-                            new_obj.set_location(mathutils.Vector(child["pos"]).xzy)
-                            # new_obj.set_scale(child["scale"])
-                            new_obj.set_scale(mathutils.Vector(child["scale"]).xyz)
-
-                            # this is right, and you nedd to use it after ...
-                            # new_obj.set_scale(mathutils.Vector(child["scale"]).xzy)
-                            # extract the quaternion and convert it to a rotation matrix
-                            rotation_mat = mathutils.Quaternion(child["rot"]).to_euler().to_matrix().to_4x4()
-
+                            blender_obj["instanceid"] = child['instanceid']
+                            # the rotation mode has to be set first, as the matrix is decomposed based on it
                             new_obj.blender_obj.rotation_mode = 'XYZ'
-                            # transform it into the blender coordinate system and then to an euler
-                            if(new_obj.has_cp("is_ABO") == True):
-                                # new_obj.set_rotation_euler((blender_rot_mat @ rotation_mat).to_euler())
-                                euler = (blender_rot_mat @ rotation_mat).to_euler()
-                                euler[0] = 0
-                                new_obj.set_rotation_euler(euler)
-                            else:
-                                new_obj.set_rotation_euler((blender_rot_mat @ rotation_mat).to_euler())
+                            new_obj.set_local2world_mat(local2world)
 
                                 
                             # if(new_obj.has_cp("is_ABO") == True):
@@ -781,12 +784,9 @@ class _Front3DLoader:
         #         created_objects.remove(obj)
         #         obj.delete(True)
 
-        # delete furniture that doesn't have room info
-        for obj in get_all_mesh_objects():
-            if obj.has_cp("3D_future_type"):
-                if obj.get_cp("3D_future_type") == "Non-Object":
-                    if obj not in created_objects:
-                        obj.delete(True)
-                    
+        # delete furniture that doesn't have room info, all at once to avoid one delete operator call per object
+        unused_furniture = [obj for obj in all_loaded_furniture if obj not in placed_furniture]
+        if unused_furniture:
+            delete_multiple(unused_furniture, remove_all_offspring=True)
 
         return created_objects
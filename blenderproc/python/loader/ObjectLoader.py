@@ -1,14 +1,17 @@
 """Provides `load_obj`, which allows to load different 3D object files. """
 
 import os
-from typing import List, Optional, Dict
+from typing import Callable, List, Optional, Dict, Set, Tuple, Union
 
 import bpy
 
 from blenderproc.python.types.MeshObjectUtility import MeshObject, convert_to_meshes
 
+# the key under which the objects of a file are stored in the object cache, see get_cache_key
+ObjectCacheKey = Union[str, Tuple[str, int, int]]
 
-def load_obj(filepath: str, cached_objects: Optional[Dict[str, List[MeshObject]]] = None,
+
+def load_obj(filepath: str, cached_objects: Optional[Dict[ObjectCacheKey, List[MeshObject]]] = None,
              use_legacy_obj_import: bool = False, **kwargs) -> List[MeshObject]:
     """ Import all objects for the given file and returns the loaded objects
 
@@ -16,8 +19,9 @@ def load_obj(filepath: str, cached_objects: Optional[Dict[str, List[MeshObject]]
     In .ply files only one object can be saved so the list has always at most one element
 
     :param filepath: the filepath to the location where the data is stored
-    :param cached_objects: a dict of filepath to objects, which have been loaded before, to avoid reloading
-                           (the dict is updated in this function)
+    :param cached_objects: a dict of file keys to objects, which have been loaded before, to avoid reloading
+                           (the dict is updated in this function). The same file reached via different paths
+                           is only loaded once.
     :param use_legacy_obj_import: If this is true the old legacy obj importer in python is used. It is slower, but
                                   it correctly imports the textures in the ShapeNet dataset.
     :param kwargs: all other params are handed directly to the bpy loading fct. check the corresponding documentation
@@ -25,70 +29,120 @@ def load_obj(filepath: str, cached_objects: Optional[Dict[str, List[MeshObject]]
     """
     if os.path.exists(filepath):
         if cached_objects is not None and isinstance(cached_objects, dict):
-            if filepath in cached_objects.keys():
+            cache_key = get_cache_key(filepath)
+            if cache_key in cached_objects:
                 created_obj = []
-                for obj in cached_objects[filepath]:
-                    # duplicate the object
+                for obj in cached_objects[cache_key]:
+                    # duplicate the object, this also copies the mesh data so the duplicates do not share it
                     created_obj.append(obj.duplicate())
                 return created_obj
-            loaded_objects = load_obj(filepath, cached_objects=None, **kwargs)
-            cached_objects[filepath] = loaded_objects
+            loaded_objects = load_obj(filepath, cached_objects=None, use_legacy_obj_import=use_legacy_obj_import,
+                                      **kwargs)
+            cached_objects[cache_key] = loaded_objects
             return loaded_objects
-        # save all selected objects
-        previously_selected_objects = bpy.context.selected_objects
-        if filepath.endswith('.obj'):
-            # load an .obj file:
-            if use_legacy_obj_import:
-                bpy.ops.import_scene.obj(filepath=filepath, **kwargs)
-            else:
-                bpy.ops.wm.obj_import(filepath=filepath, **kwargs)
-        elif filepath.endswith('.ply'):
-            # load a .ply mesh
-            bpy.ops.import_mesh.ply(filepath=filepath, **kwargs)
-            # add a default material to ply file
-            mat = bpy.data.materials.new(name="ply_material")
-            mat.use_nodes = True
-            selected_objects = [obj for obj in bpy.context.selected_objects
-                                if obj not in previously_selected_objects]
-            for obj in selected_objects:
-                obj.data.materials.append(mat)
-        elif filepath.endswith('.dae'):
-            bpy.ops.wm.collada_import(filepath=filepath)
-        elif filepath.lower().endswith('.stl'):
-            # load a .stl file
-            bpy.ops.import_mesh.stl(filepath=filepath, **kwargs)
-            # add a default material to stl file
-            mat = bpy.data.materials.new(name="stl_material")
-            mat.use_nodes = True
-            selected_objects = [obj for obj in bpy.context.selected_objects if
-                                obj not in previously_selected_objects]
-            for obj in selected_objects:
-                obj.data.materials.append(mat)
-                
-        elif filepath.lower().endswith('.glb'):
-            bpy.ops.import_scene.gltf(filepath=filepath, **kwargs)
-            mat = bpy.data.materials.new(name="glb_material")
-            mat.use_nodes = True
-            selected_objects = [obj for obj in bpy.context.selected_objects if
-                                obj not in previously_selected_objects]
-            mesh_objects = [obj for obj in bpy.context.selected_objects if
-                    obj.data is not None]
-
-            new_entity = mesh_objects[0].copy()
-            new_entity.data = mesh_objects[0].data.copy()
-            new_entity.dimensions = mesh_objects[0].dimensions.copy() 
-            bpy.context.collection.objects.link(new_entity)
-            all = bpy.data.objects
-            for obj in selected_objects:
-                all.remove(obj, do_unlink=True)
-
-            duplicate_obj = MeshObject(new_entity)
-            # duplicate_obj.set_scale()
-            duplicate_obj.blender_obj.data.materials.append(mat)
-
-            return duplicate_obj
-                
-
-        return convert_to_meshes([obj for obj in bpy.context.selected_objects
-                                  if obj not in previously_selected_objects])
+        # save all selected objects, by pointer to make the later membership tests cheap
+        previously_selected_objects = {obj.as_pointer() for obj in bpy.context.selected_objects}
+        importer = _OBJECT_IMPORTERS.get(os.path.splitext(filepath)[1].lower())
+        if importer is None:
+            # unknown file types are not imported
+            return []
+        if importer is _import_obj:
+            # only the obj importer distinguishes between the legacy and the new importer
+            kwargs["use_legacy_obj_import"] = use_legacy_obj_import
+        return importer(filepath, previously_selected_objects, **kwargs)
     raise FileNotFoundError(f"The given filepath does not exist: {filepath}")
+
+
+def get_cache_key(filepath: str) -> ObjectCacheKey:
+    """ Returns the key under which the objects of the given file are stored in the object cache.
+
+    The key consists of the absolute path, the file size and the modification time, such that the same file is
+    found independent of the path used to access it. If the file can not be inspected, the filepath is used.
+
+    :param filepath: The path to the file.
+    :return: The cache key.
+    """
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return filepath
+    return os.path.realpath(filepath), stat.st_size, int(stat.st_mtime)
+
+
+def _get_newly_selected_objects(previously_selected_objects: Set[int]) -> List[bpy.types.Object]:
+    """ Returns all selected objects which were not selected before the import.
+
+    :param previously_selected_objects: The pointers of the objects which were selected before the import.
+    :return: The list of newly selected objects.
+    """
+    return [obj for obj in bpy.context.selected_objects if obj.as_pointer() not in previously_selected_objects]
+
+
+def _import_obj(filepath: str, previously_selected_objects: Set[int], use_legacy_obj_import: bool = False,
+                **kwargs) -> List[MeshObject]:
+    """ Imports an .obj file, see load_obj for the parameters. """
+    if use_legacy_obj_import:
+        bpy.ops.import_scene.obj(filepath=filepath, **kwargs)
+    else:
+        bpy.ops.wm.obj_import(filepath=filepath, **kwargs)
+    return convert_to_meshes(_get_newly_selected_objects(previously_selected_objects))
+
+
+def _import_ply(filepath: str, previously_selected_objects: Set[int], **kwargs) -> List[MeshObject]:
+    """ Imports a .ply file and adds a default material, see load_obj for the parameters. """
+    bpy.ops.import_mesh.ply(filepath=filepath, **kwargs)
+    return _add_default_material(_get_newly_selected_objects(previously_selected_objects), "ply_material")
+
+
+def _import_dae(filepath: str, previously_selected_objects: Set[int], **kwargs) -> List[MeshObject]:
+    """ Imports a .dae file, see load_obj for the parameters. """
+    bpy.ops.wm.collada_import(filepath=filepath, **kwargs)
+    return convert_to_meshes(_get_newly_selected_objects(previously_selected_objects))
+
+
+def _import_stl(filepath: str, previously_selected_objects: Set[int], **kwargs) -> List[MeshObject]:
+    """ Imports a .stl file and adds a default material, see load_obj for the parameters. """
+    bpy.ops.import_mesh.stl(filepath=filepath, **kwargs)
+    return _add_default_material(_get_newly_selected_objects(previously_selected_objects), "stl_material")
+
+
+def _import_glb(filepath: str, previously_selected_objects: Set[int], **kwargs) -> MeshObject:
+    """ Imports a .glb file and only keeps its first mesh object, see load_obj for the parameters. """
+    bpy.ops.import_scene.gltf(filepath=filepath, **kwargs)
+    mat = bpy.data.materials.new(name="glb_material")
+    mat.use_nodes = True
+    selected_objects = _get_newly_selected_objects(previously_selected_objects)
+    mesh_objects = [obj for obj in selected_objects if obj.data is not None]
+
+    # keep only the first mesh object and remove all other imported objects in one go
+    target = mesh_objects[0]
+    bpy.data.batch_remove(ids=[obj for obj in selected_objects if obj != target])
+
+    loaded_obj = MeshObject(target)
+    loaded_obj.blender_obj.data.materials.append(mat)
+
+    return loaded_obj
+
+
+def _add_default_material(selected_objects: List[bpy.types.Object], material_name: str) -> List[MeshObject]:
+    """ Adds a new default material to all given objects.
+
+    :param selected_objects: The newly imported objects.
+    :param material_name: The name of the new material.
+    :return: The list of loaded mesh objects.
+    """
+    mat = bpy.data.materials.new(name=material_name)
+    mat.use_nodes = True
+    for obj in selected_objects:
+        obj.data.materials.append(mat)
+    return convert_to_meshes(selected_objects)
+
+
+# maps the lower case file extension to the function importing files of this type
+_OBJECT_IMPORTERS: Dict[str, Callable[..., Union[List[MeshObject], MeshObject]]] = {
+    ".obj": _import_obj,
+    ".ply": _import_ply,
+    ".dae": _import_dae,
+    ".stl": _import_stl,
+    ".glb": _import_glb
+}
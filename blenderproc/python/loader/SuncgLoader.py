@@ -16,7 +16,7 @@ from blenderproc.python.utility.MathUtility import change_coordinate_frame_of_po
 from blenderproc.python.types.EntityUtility import create_empty, Entity
 from blenderproc.python.types.MeshObjectUtility import create_primitive, MeshObject
 from blenderproc.python.utility.Utility import Utility, resolve_path, resolve_resource
-from blenderproc.python.loader.ObjectLoader import load_obj
+from blenderproc.python.loader.ObjectLoader import load_obj, get_cache_key, ObjectCacheKey
 
 
 def load_suncg(house_path: str, label_mapping: LabelIdMapping,
@@ -119,7 +119,7 @@ def load_suncg(house_path: str, label_mapping: LabelIdMapping,
 
 class _SuncgLoader:
     suncg_dir: Optional[str] = None
-    collection_of_loaded_objs: Dict[str, List[MeshObject]] = {}
+    collection_of_loaded_objs: Dict[ObjectCacheKey, List[MeshObject]] = {}
     collection_of_loaded_mats: Dict[str, Dict[str, Material]] = {}
 
     @staticmethod
@@ -292,7 +292,7 @@ class _SuncgLoader:
         if not os.path.exists(path):
             print(f"Warning: {path} is missing!")
             return []
-        object_already_loaded = path in _SuncgLoader.collection_of_loaded_objs
+        object_already_loaded = get_cache_key(path) in _SuncgLoader.collection_of_loaded_objs
         loaded_objects = load_obj(filepath=path, cached_objects=_SuncgLoader.collection_of_loaded_objs)
         if object_already_loaded:
             print(f"Duplicate object: {path}")
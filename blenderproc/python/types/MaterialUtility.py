@@ -1,13 +1,36 @@
 """ The material class containing the texture and material properties. """
 
-from typing import List, Union
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import bpy
 
 from blenderproc.python.utility import BlenderUtility
 from blenderproc.python.types.StructUtility import Struct
+from blenderproc.python.types.MaterialUtilityFunctions import NODE_TYPE_GROUP, NODE_TYPE_INVERT, NODE_TYPE_MAPPING, \
+    NODE_TYPE_MATH, NODE_TYPE_MIX_RGB, NODE_TYPE_MIX_SHADER, NODE_TYPE_TEX_COORD, NODE_TYPE_TEX_IMAGE, \
+    INFUSE_MATERIAL_MODES, INFUSE_MATERIAL_NODE_FACTORIES, INFUSE_TEXTURE_BLEND_TYPES, INFUSE_TEXTURE_MODES, \
+    apply_emission_bsdf_presets, get_input_names, get_input_socket, get_output_socket
 from blenderproc.python.utility.Utility import Utility
 
+# name of the custom property, which stores the name of the function a node was created in
+_CREATED_IN_FUNC = "created_in_func"
+
+
+def _with_batched_edits(func: Callable) -> Callable:
+    """ Decorates a Material method, so that all of its node tree edits are done inside of Material._batched_edits.
+
+    :param func: The method to decorate.
+    :return: The decorated method.
+    """
+    @wraps(func)
+    def wrapper(self: "Material", *args, **kwargs):
+        # pylint: disable=protected-access
+        with self._batched_edits():
+            return func(self, *args, **kwargs)
+    return wrapper
+
 
 class Material(Struct):
     """
@@ -15,6 +38,19 @@ class Material(Struct):
     of MeshObjects.
     """
 
+    # the only attributes which can be set on a material, the base class still provides __dict__ and __weakref__
+    __slots__ = ("links", "nodes", "_nodes_by_type", "_nodes_by_func", "_indexed_node_count", "_batched_edits_depth")
+    _SETTABLE_ATTRIBUTES = frozenset(__slots__ + ("blender_obj",))
+
+    # the created_in_func values of the nodes created by the make_* functions, these are the function names
+    _TAG_TRANSPARENT = "make_transparent"
+    _TAG_TRANSPARENT_LIGHT = "make_transparent_light"
+    _TAG_POINT_LIGHT_INDIRECT_EFFECT = "make_point_light_indirect_effect"
+    _TAG_LIGHT_INDIRECT_EFFECT = "make_light_indirect_effect"
+    _TAG_INDIRECT_EFFECT_V2 = "make_indirect_effect_v2"
+    _TAG_EMISSIVE = "make_emissive"
+    # the created_in_func value of the texture coordinate and mapping nodes, which are shared by all infused textures
+    _TAG_INFUSE_TEXTURE = "infuse_texture"
 
     def __init__(self, material: bpy.types.Material):
         super().__init__(material)
@@ -24,6 +60,8 @@ class Material(Struct):
 
         self.nodes = material.node_tree.nodes
         self.links = material.node_tree.links
+        self._reset_node_index()
+        self._batched_edits_depth = 0
 
     def update_blender_ref(self, name):
         """ Updates the contained blender reference using the given name of the instance.
@@ -33,6 +71,54 @@ class Material(Struct):
         self.blender_obj = bpy.data.materials[name]
         self.nodes = bpy.data.materials[name].node_tree.nodes
         self.links = bpy.data.materials[name].node_tree.links
+        self._reset_node_index()
+
+    def _reset_node_index(self):
+        """ Drops the cached node lookups, they are rebuilt lazily on the next access. """
+        # maps the node_type used in a lookup to all nodes whose bl_idname contains it
+        self._nodes_by_type = {}
+        # maps the created_in_func custom property to the nodes carrying it, built on first use
+        self._nodes_by_func = None
+        self._indexed_node_count = len(self.nodes)
+
+    def _validate_node_index(self):
+        """ Resets the cached node lookups, if they might not match the node tree anymore.
+
+        Nodes removed and added without using this wrapper do not necessarily change the number of nodes, so the
+        lookups are only kept during _batched_edits, in which all edits are done via this wrapper.
+        """
+        if self._batched_edits_depth == 0 or len(self.nodes) != self._indexed_node_count:
+            self._reset_node_index()
+
+    def get_links_to_socket(self, dest_socket: bpy.types.NodeSocket) -> List[bpy.types.NodeLink]:
+        """ Returns all links which end in the given socket.
+
+        The links of the node tree are only iterated if the socket is linked at all.
+
+        :param dest_socket: The destination socket.
+        :return: The list of links ending in the given socket.
+        """
+        if not dest_socket.is_linked:
+            return []
+        return [link for link in self.links if link.to_socket == dest_socket]
+
+    @contextmanager
+    def _batched_edits(self) -> Iterator[None]:
+        """ Groups several edits of the node tree, so that the node tree is tagged for an update only once.
+
+        Nested calls are allowed, the update is only triggered when the outermost one is left. The cached node
+        lookups are only kept inside of the outermost call.
+        """
+        if self._batched_edits_depth == 0:
+            # the node tree might have been changed without using this wrapper since the last batch
+            self._reset_node_index()
+        self._batched_edits_depth += 1
+        try:
+            yield
+        finally:
+            self._batched_edits_depth -= 1
+            if self._batched_edits_depth == 0:
+                self.blender_obj.node_tree.update_tag()
 
     def get_users(self) -> int:
         """ Returns the number of users of the material.
@@ -57,7 +143,14 @@ class Material(Struct):
         :param created_in_func: only return node created by the specified function
         :return: The node.
         """
-        return Utility.get_the_one_node_with_type(self.nodes, node_type, created_in_func)
+        if created_in_func:
+            nodes = self.get_nodes_with_type(node_type, created_in_func)
+        else:
+            # the cached list is only read here, so it does not have to be copied
+            nodes = self._get_indexed_nodes_with_type(node_type)
+        if len(nodes) == 1:
+            return nodes[0]
+        raise RuntimeError(f"There is not only one node of this type: {node_type}, there are: {len(nodes)}")
 
     def get_nodes_with_type(self, node_type: str, created_in_func: str = "") -> List[bpy.types.Node]:
         """ Returns all nodes which are of the given node_type
@@ -66,7 +159,30 @@ class Material(Struct):
         :param created_in_func: only return nodes created by the specified function
         :return: The list of nodes with the given type.
         """
-        return Utility.get_nodes_with_type(self.nodes, node_type, created_in_func)
+        nodes_with_type = self._get_indexed_nodes_with_type(node_type)
+        if created_in_func:
+            return Utility.get_nodes_created_in_func(nodes_with_type, created_in_func)
+        return list(nodes_with_type)
+
+    def _first_node_of_type(self, node_type: str) -> Optional[bpy.types.Node]:
+        """ Returns the first node which is of the given node_type.
+
+        :param node_type: The node type to look for.
+        :return: The first node with the given type or None, if there is no such node.
+        """
+        nodes_with_type = self._get_indexed_nodes_with_type(node_type)
+        return nodes_with_type[0] if nodes_with_type else None
+
+    def _get_indexed_nodes_with_type(self, node_type: str) -> List[bpy.types.Node]:
+        """ Returns the cached list of nodes with the given type, the returned list must not be modified.
+
+        :param node_type: The node type to look for.
+        :return: The cached list of nodes with the given type.
+        """
+        self._validate_node_index()
+        if node_type not in self._nodes_by_type:
+            self._nodes_by_type[node_type] = Utility.get_nodes_with_type(self.nodes, node_type)
+        return self._nodes_by_type[node_type]
 
     def get_nodes_created_in_func(self, created_in_func: str) -> List[bpy.types.Node]:
         """ Returns all nodes which are of the given node_type
@@ -74,7 +190,28 @@ class Material(Struct):
         :param created_in_func: return all nodes created in the given function
         :return: The list of nodes with the given type.
         """
-        return Utility.get_nodes_created_in_func(self.nodes, created_in_func)
+        return list(self._get_nodes_by_func().get(created_in_func, []))
+
+    def has_nodes_created_in_func(self, created_in_func: str) -> bool:
+        """ Checks if there is at least one node which was created in the given function.
+
+        :param created_in_func: The function name to look for.
+        :return: True, if such a node exists.
+        """
+        return bool(self._get_nodes_by_func().get(created_in_func))
+
+    def _get_nodes_by_func(self) -> Dict[str, List[bpy.types.Node]]:
+        """ Returns the index from the created_in_func values to their nodes, builds it if necessary.
+
+        :return: The dict mapping each created_in_func value to the nodes carrying it.
+        """
+        self._validate_node_index()
+        if self._nodes_by_func is None:
+            self._nodes_by_func = {}
+            for node in self.nodes:
+                if _CREATED_IN_FUNC in node:
+                    self._nodes_by_func.setdefault(node[_CREATED_IN_FUNC], []).append(node)
+        return self._nodes_by_func
 
     def new_node(self, node_type: str, created_in_func: str = "") -> bpy.types.Node:
         """ Creates a new node in the material's node tree.
@@ -84,9 +221,19 @@ class Material(Struct):
                                 Allows to later retrieve and delete specific nodes again.
         :return: The new node.
         """
+        self._validate_node_index()
         new_node = self.nodes.new(node_type)
         if created_in_func:
-            new_node["created_in_func"] = created_in_func
+            new_node[_CREATED_IN_FUNC] = created_in_func
+            if self._nodes_by_func is not None:
+                self._nodes_by_func.setdefault(created_in_func, []).append(new_node)
+        if self._nodes_by_type:
+            # read the type only once, each access goes through the RNA
+            bl_idname = new_node.bl_idname
+            for indexed_type, nodes_with_type in self._nodes_by_type.items():
+                if indexed_type in bl_idname:
+                    nodes_with_type.append(new_node)
+        self._indexed_node_count += 1
         return new_node
 
     def remove_node(self, node: bpy.types.Node):
@@ -94,7 +241,28 @@ class Material(Struct):
 
         :param node: The node to remove.
         """
-        self.nodes.remove(node)
+        self.remove_nodes([node])
+
+    def remove_nodes(self, nodes: List[bpy.types.Node]):
+        """ Removes the given nodes from the material's node tree.
+
+        :param nodes: The nodes to remove.
+        """
+        if not nodes:
+            return
+        self._validate_node_index()
+        removed_pointers = {node.as_pointer() for node in nodes}
+        # update the cached lookups once for all nodes, instead of once per node
+        for nodes_with_type in self._nodes_by_type.values():
+            nodes_with_type[:] = [node for node in nodes_with_type if node.as_pointer() not in removed_pointers]
+        if self._nodes_by_func is not None:
+            for nodes_created_in_func in self._nodes_by_func.values():
+                nodes_created_in_func[:] = [node for node in nodes_created_in_func
+                                            if node.as_pointer() not in removed_pointers]
+        nodes_remove = self.nodes.remove
+        for node in nodes:
+            nodes_remove(node)
+        self._indexed_node_count -= len(nodes)
 
     def insert_node_instead_existing_link(self, source_socket: bpy.types.NodeSocket,
                                           new_node_dest_socket: bpy.types.NodeSocket,
@@ -121,15 +289,23 @@ class Material(Struct):
         """
         self.links.new(source_socket, dest_socket)
 
+    def link_all(self, socket_pairs: List[Tuple[bpy.types.NodeSocket, bpy.types.NodeSocket]]):
+        """ Creates a new link for each of the given socket pairs, in the given order.
+
+        :param socket_pairs: A list of (source socket, destination socket) tuples.
+        """
+        links_new = self.links.new
+        for source_socket, dest_socket in socket_pairs:
+            links_new(source_socket, dest_socket)
+
     def unlink(self, source_socket: bpy.types.NodeSocket, dest_socket: bpy.types.NodeSocket):
         """ Removes the link between the two given sockets.
 
         :param source_socket: The source socket.
         :param dest_socket: The destination socket
         """
-        links = self.links
-        for link in links:
-            if link.to_node == dest_socket:
+        for link in self.get_links_to_socket(dest_socket):
+            if link.from_socket == source_socket:
                 self.links.remove(link)
                 break
 
@@ -148,7 +324,7 @@ class Material(Struct):
             attr_node.attribute_name = layer_name
             # connect it to base color of principled bsdf
             principled_bsdf = self.get_the_one_node_with_type("BsdfPrincipled")
-            self.links.new(attr_node.outputs['Color'], principled_bsdf.inputs['Base Color'])
+            self.link(attr_node.outputs['Color'], principled_bsdf.inputs['Base Color'])
         else:
             # create new vertex color shade node
             vcol = self.nodes.new(type="ShaderNodeVertexColor")
@@ -159,8 +335,8 @@ class Material(Struct):
             self.nodes.remove(node_connected_to_output)
             background_color_node = self.nodes.new(type="ShaderNodeBackground")
             if 'Color' in background_color_node.inputs:
-                self.links.new(vcol.outputs['Color'], background_color_node.inputs['Color'])
-                self.links.new(background_color_node.outputs["Background"], material_output.inputs["Surface"])
+                self.link(vcol.outputs['Color'], background_color_node.inputs['Color'])
+                self.link(background_color_node.outputs["Background"], material_output.inputs["Surface"])
             else:
                 raise RuntimeError(f"Material '{self.blender_obj.name}' has no node connected to the output, "
                                    f"which has as a 'Base Color' input.")
@@ -169,216 +345,250 @@ class Material(Struct):
 
 
 
-    def remove_transparent(self):
-        for node in self.get_nodes_created_in_func(self.make_transparent.__name__):
-            self.remove_node(node)
+    def _remove_nodes_created_in_funcs(self, func_names: List[str]):
+        """ Removes all nodes which were created in one of the given functions.
+
+        The links to the material output are not restored, the calling function has to take care of this.
+
+        :param func_names: The names of the functions whose nodes should be removed.
+        """
+        nodes_by_func = self._get_nodes_by_func()
+        nodes_to_remove = []
+        for func_name in func_names:
+            nodes_to_remove.extend(nodes_by_func.get(func_name, []))
+        self.remove_nodes(nodes_to_remove)
+
+    def _strip_created_by(self, created_in_func: str):
+        """ Removes all nodes created in the given function and links the principled bsdf to the output again.
+
+        The link is only restored, if at least one node had to be removed.
+
+        :param created_in_func: The name of the function whose nodes should be removed.
+        """
+        if not self.has_nodes_created_in_func(created_in_func):
+            return
+        self.remove_nodes(self.get_nodes_created_in_func(created_in_func))
 
         output_node = self.get_the_one_node_with_type("OutputMaterial")
-        if len(self.get_nodes_with_type("BsdfPrincipled")) == 0:
+        principled_bsdf = self._first_node_of_type("BsdfPrincipled")
+        if principled_bsdf is None:
             return
-        
-        principled_bsdf = self.get_nodes_with_type("BsdfPrincipled")[0]
-        self.link(principled_bsdf.outputs['BSDF'], output_node.inputs['Surface'])
+        self.link(get_output_socket(principled_bsdf, 'BSDF'), get_input_socket(output_node, 'Surface'))
+
+    def _new_gated_mix_shader(self, shader_1: Optional[bpy.types.NodeSocket],
+                              shader_2: Optional[bpy.types.NodeSocket], fac_socket: bpy.types.NodeSocket,
+                              created_in_func: str, threshold: Optional[float] = None,
+                              operation: str = "LESS_THAN") -> bpy.types.Node:
+        """ Creates a mix shader, which switches between the two given shaders based on the given factor socket.
+
+        :param shader_1: The shader used if the factor is 0, if None the input stays unconnected.
+        :param shader_2: The shader used if the factor is 1, if None the input stays unconnected.
+        :param fac_socket: The socket determining the factor, usually an output of a light path node.
+        :param created_in_func: The function name saved in all created nodes.
+        :param threshold: If given, the factor is the result of a math node comparing fac_socket with this value.
+        :param operation: The operation of the math node used for the comparison.
+        :return: The mix shader node.
+        """
+        if threshold is not None:
+            math_node = self.new_node(NODE_TYPE_MATH, created_in_func)
+            math_node.operation = operation
+            math_node.inputs[1].default_value = threshold
+            self.link(fac_socket, math_node.inputs[0])
+            fac_socket = math_node.outputs['Value']
+        mix_node = self.new_node(NODE_TYPE_MIX_SHADER, created_in_func)
+        self.link(fac_socket, mix_node.inputs['Fac'])
+        if shader_1 is not None:
+            self.link(shader_1, mix_node.inputs[1])
+        if shader_2 is not None:
+            self.link(shader_2, mix_node.inputs[2])
+        return mix_node
+
+    def _base_color_source(self, principled_bsdf: bpy.types.Node) -> Optional[bpy.types.NodeSocket]:
+        """ Returns the socket connected to the "Base Color" input of the given principled bsdf.
+
+        :param principled_bsdf: The principled bsdf node.
+        :return: The connected output socket or None, if the base color is not linked.
+        """
+        base_color_links = self.get_links_to_socket(get_input_socket(principled_bsdf, "Base Color"))
+        return base_color_links[0].from_socket if base_color_links else None
+
+    def remove_transparent(self):
+        """ Removes the transparent part of the material and links the principled bsdf to the output again.
+        """
+        self._strip_created_by(self._TAG_TRANSPARENT)
 
     def remove_light_indirect_effect(self):
-        for node in self.get_nodes_created_in_func(self.make_light_indirect_effect.__name__):
-            self.remove_node(node) 
+        self._remove_nodes_created_in_funcs([self._TAG_LIGHT_INDIRECT_EFFECT])
 
     def remove_emissive(self):
         """ Remove emissive part of the material.
         """
-        for node in self.get_nodes_created_in_func(self.make_emissive.__name__):
-            self.remove_node(node)
+        self._remove_nodes_created_in_funcs([self._TAG_EMISSIVE])
 
     def remove_transparent_light(self):
         """ Remove emissive part of the material.
         """
-        for node in self.get_nodes_created_in_func(self.make_transparent_light.__name__):
-            self.remove_node(node)
+        self._remove_nodes_created_in_funcs([self._TAG_TRANSPARENT_LIGHT])
 
-    def remove_point_light_indirect_effect(self):
-        for node in self.get_nodes_created_in_func(self.make_point_light_indirect_effect.__name__):
-            self.remove_node(node)
+    def remove_point_light_indirect_effect(self, output_node: Optional[bpy.types.Node] = None,
+                                           emission_node: Optional[bpy.types.Node] = None):
+        """ Removes the indirect effect of the point light and links its emission to the output again.
 
-        output_node = self.get_the_one_node_with_type("ShaderNodeOutputLight")
-        emission_node = self.get_nodes_with_type("Emission")[0]
-        self.link(emission_node.outputs['Emission'], output_node.inputs['Surface'])
+        :param output_node: The light output node, if already known to the caller.
+        :param emission_node: The original emission node of the light, if already known to the caller.
+        """
+        if not self.has_nodes_created_in_func(self._TAG_POINT_LIGHT_INDIRECT_EFFECT):
+            return
+        self.remove_nodes(self.get_nodes_created_in_func(self._TAG_POINT_LIGHT_INDIRECT_EFFECT))
+
+        if output_node is None:
+            output_node = self.get_the_one_node_with_type("ShaderNodeOutputLight")
+        if emission_node is None:
+            emission_node = self._first_node_of_type("Emission")
+        self.link(emission_node.outputs['Emission'], get_input_socket(output_node, 'Surface'))
     
     def remove_indirect_effect_v2(self):
-        for node in self.get_nodes_created_in_func(self.make_indirect_effect_v2.__name__):
-            self.remove_node(node) 
-
-        output_node = self.get_the_one_node_with_type("OutputMaterial")
-        if len(self.get_nodes_with_type("BsdfPrincipled")) == 0:
-            return
-        principled_bsdf = self.get_nodes_with_type("BsdfPrincipled")[0]
-        self.link(principled_bsdf.outputs['BSDF'], output_node.inputs['Surface'])
+        """ Removes the indirect effect of the material and links the principled bsdf to the output again.
+        """
+        self._strip_created_by(self._TAG_INDIRECT_EFFECT_V2)
 
-        
+    @_with_batched_edits
     def make_transparent(self):
 
-        self.remove_emissive()
-        self.remove_transparent()
+        self._remove_nodes_created_in_funcs([self._TAG_EMISSIVE, self._TAG_TRANSPARENT])
 
         output_node = self.get_the_one_node_with_type("OutputMaterial")
-        if len(self.get_nodes_with_type("BsdfPrincipled")) == 0:
+        principled_bsdf = self._first_node_of_type("BsdfPrincipled")
+        if principled_bsdf is None:
             return
-        principled_bsdf = self.get_the_one_node_with_type("BsdfPrincipled")
-        transparent_node = self.new_node('ShaderNodeBsdfTransparent', self.make_transparent.__name__)
-        light_path_node = self.new_node('ShaderNodeLightPath', self.make_transparent.__name__)
-        mix_node = self.new_node('ShaderNodeMixShader', self.make_transparent.__name__)
-
-        self.unlink(principled_bsdf.outputs['BSDF'], output_node.inputs['Surface'])
-        self.link(transparent_node.outputs['BSDF'], mix_node.inputs[1])
-        self.link(principled_bsdf.outputs['BSDF'], mix_node.inputs[2])
-        self.link(mix_node.outputs['Shader'], output_node.inputs['Surface'])
-        self.link(light_path_node.outputs['Is Camera Ray'], mix_node.inputs['Fac'])
+        transparent_node = self.new_node('ShaderNodeBsdfTransparent', self._TAG_TRANSPARENT)
+        light_path_node = self.new_node('ShaderNodeLightPath', self._TAG_TRANSPARENT)
+
+        self.unlink(get_output_socket(principled_bsdf, 'BSDF'), get_input_socket(output_node, 'Surface'))
+        mix_node = self._new_gated_mix_shader(transparent_node.outputs['BSDF'],
+                                              get_output_socket(principled_bsdf, 'BSDF'),
+                                              light_path_node.outputs['Is Camera Ray'],
+                                              self._TAG_TRANSPARENT)
+        self.link(mix_node.outputs['Shader'], get_input_socket(output_node, 'Surface'))
     
+    @_with_batched_edits
     def make_transparent_light(self, emission_strength, emission_color):
-        self.remove_emissive()
-        self.remove_transparent_light()
+        self._remove_nodes_created_in_funcs([self._TAG_EMISSIVE, self._TAG_TRANSPARENT_LIGHT])
 
         # self.nodes = material.node_tree.nodes 
         # self.node_tree.nodes['Principled BSDF']
         output_node = self.get_the_one_node_with_type("OutputMaterial")
         principled_bsdf = self.get_the_one_node_with_type("BsdfPrincipled")
 
-        mix_node1 = self.new_node('ShaderNodeMixShader', self.make_transparent_light.__name__)
-        mix_node2 = self.new_node('ShaderNodeMixShader', self.make_transparent_light.__name__)
-        Less_Than = self.new_node('ShaderNodeMath', self.make_transparent_light.__name__)
-        Less_Than.operation = 'LESS_THAN'
-        light_path_node = self.new_node('ShaderNodeLightPath', self.make_transparent_light.__name__)
-        emission_node = self.new_node('ShaderNodeEmission', self.make_transparent_light.__name__)
-        emission_node_H = self.new_node('ShaderNodeEmission', self.make_transparent_light.__name__)
+        light_path_node = self.new_node('ShaderNodeLightPath', self._TAG_TRANSPARENT_LIGHT)
+        emission_node = self.new_node('ShaderNodeEmission', self._TAG_TRANSPARENT_LIGHT)
+        emission_node_H = self.new_node('ShaderNodeEmission', self._TAG_TRANSPARENT_LIGHT)
 
         if emission_color is None:
-            
-            if len(principled_bsdf.inputs["Base Color"].links) == 1:
-                # get the node connected to the Base Color
-                socket_connected_to_the_base_color = principled_bsdf.inputs["Base Color"].links[0].from_socket
+            socket_connected_to_the_base_color = self._base_color_source(principled_bsdf)
+            if socket_connected_to_the_base_color is not None:
                 self.link(socket_connected_to_the_base_color, emission_node.inputs["Color"])
             else:
-                emission_node.inputs["Color"].default_value = principled_bsdf.inputs["Base Color"].default_value
+                base_color = get_input_socket(principled_bsdf, "Base Color")
+                emission_node.inputs["Color"].default_value = base_color.default_value
         else:
             emission_node.inputs["Color"].default_value = emission_color
     
         emission_node.inputs['Strength'].default_value = emission_strength
         emission_node_H.inputs['Strength'].default_value = emission_strength + 1 
 
-        self.unlink(principled_bsdf.outputs['BSDF'], output_node.inputs['Surface'])
-        self.link(emission_node_H.outputs['Emission'], mix_node1.inputs[1])
-        self.link(principled_bsdf.outputs['BSDF'], mix_node2.inputs[2])
-        self.link(light_path_node.outputs['Transparent Depth'], Less_Than.inputs[0])
-        self.link(emission_node.outputs['Emission'], mix_node1.inputs[2])
-        Less_Than.inputs[1].default_value = 2.0 
-        self.link(Less_Than.outputs['Value'], mix_node1.inputs['Fac'])
-        self.link(light_path_node.outputs['Is Camera Ray'], mix_node2.inputs['Fac'])
-        self.link(mix_node1.outputs['Shader'], mix_node2.inputs[1])
-        self.link(mix_node2.outputs['Shader'],output_node.inputs['Surface'])
+        self.unlink(get_output_socket(principled_bsdf, 'BSDF'), get_input_socket(output_node, 'Surface'))
+        mix_node1 = self._new_gated_mix_shader(emission_node_H.outputs['Emission'], emission_node.outputs['Emission'],
+                                               light_path_node.outputs['Transparent Depth'],
+                                               self._TAG_TRANSPARENT_LIGHT, threshold=2.0)
+        mix_node2 = self._new_gated_mix_shader(mix_node1.outputs['Shader'], get_output_socket(principled_bsdf, 'BSDF'),
+                                               light_path_node.outputs['Is Camera Ray'],
+                                               self._TAG_TRANSPARENT_LIGHT)
+        self.link(mix_node2.outputs['Shader'],get_input_socket(output_node, 'Surface'))
     
+    @_with_batched_edits
     def make_point_light_indirect_effect(self):
-        self.remove_point_light_indirect_effect()
-        # print(self.nodes[0].bl_idname)
-        # print(self.nodes[0].bl_idname)
+        # the original emission node comes before the ones added by earlier calls, so it can be fetched up front
         output_node = self.get_the_one_node_with_type("ShaderNodeOutputLight")
-        emission_node1 = self.get_nodes_with_type("Emission")[0]
-        self.unlink(emission_node1.outputs['Emission'], output_node.inputs['Surface'])
+        emission_node1 = self._first_node_of_type("Emission")
+        self.remove_point_light_indirect_effect(output_node, emission_node1)
+        self.unlink(emission_node1.outputs['Emission'], get_input_socket(output_node, 'Surface'))
 
-        mix_node = self.new_node('ShaderNodeMixShader', self.make_point_light_indirect_effect.__name__)
-        Less_Than = self.new_node('ShaderNodeMath', self.make_point_light_indirect_effect.__name__)
-        Less_Than.operation = 'LESS_THAN'
-        emission_node2 = self.new_node("ShaderNodeEmission", self.make_point_light_indirect_effect.__name__)
-        light_path_node = self.new_node('ShaderNodeLightPath', self.make_point_light_indirect_effect.__name__)
+        emission_node2 = self.new_node("ShaderNodeEmission", self._TAG_POINT_LIGHT_INDIRECT_EFFECT)
+        light_path_node = self.new_node('ShaderNodeLightPath', self._TAG_POINT_LIGHT_INDIRECT_EFFECT)
 
         emission_node2.inputs['Strength'].default_value = 0.0
 
-        self.link(light_path_node.outputs['Ray Depth'], Less_Than.inputs[0])
-        self.link(emission_node1.outputs['Emission'], mix_node.inputs[1])
-        self.link(emission_node2.outputs['Emission'], mix_node.inputs[2])
-
-        Less_Than.inputs[1].default_value = 2.0
-        self.link(Less_Than.outputs['Value'], mix_node.inputs['Fac'])
-        self.link(mix_node.outputs['Shader'],output_node.inputs['Surface'])
+        mix_node = self._new_gated_mix_shader(emission_node1.outputs['Emission'], emission_node2.outputs['Emission'],
+                                              light_path_node.outputs['Ray Depth'],
+                                              self._TAG_POINT_LIGHT_INDIRECT_EFFECT, threshold=2.0)
+        self.link(mix_node.outputs['Shader'],get_input_socket(output_node, 'Surface'))
 
+    @_with_batched_edits
     def make_light_indirect_effect(self, emission_strength: float, emission_color: List[float] = None):
-        self.remove_emissive()
-        self.remove_transparent()
-        self.remove_light_indirect_effect()
-        self.remove_transparent_light()
+        self._remove_nodes_created_in_funcs([self._TAG_EMISSIVE, self._TAG_TRANSPARENT,
+                                             self._TAG_LIGHT_INDIRECT_EFFECT,
+                                             self._TAG_TRANSPARENT_LIGHT])
 
         # self.nodes = material.node_tree.nodes 
         # self.node_tree.nodes['Principled BSDF']
         output_node = self.get_the_one_node_with_type("OutputMaterial")
-        if len(self.get_nodes_with_type("BsdfPrincipled")) == 0:
+        principled_bsdf = self._first_node_of_type("BsdfPrincipled")
+        if principled_bsdf is None:
             return
-        principled_bsdf = self.get_nodes_with_type("BsdfPrincipled")[0]
 
-        mix_node1 = self.new_node('ShaderNodeMixShader', self.make_light_indirect_effect.__name__)
-        mix_node2 = self.new_node('ShaderNodeMixShader', self.make_light_indirect_effect.__name__)
-        Less_Than = self.new_node('ShaderNodeMath', self.make_light_indirect_effect.__name__)
-        Less_Than.operation = 'LESS_THAN'
-        light_path_node = self.new_node('ShaderNodeLightPath', self.make_light_indirect_effect.__name__)
-        # emission_node = self.new_node('ShaderNodeEmission', self.make_light_indirect_effect.__name__)
-        emission_node_bsdf = self.new_node('ShaderNodeBsdfPrincipled', self.make_emissive.__name__)
-            # Subsurface IOR
-        emission_node_bsdf.inputs['Subsurface'].default_value = 0.0
-        emission_node_bsdf.inputs['Specular'].default_value = 0.0
-        emission_node_bsdf.inputs['Roughness'].default_value = 0.0
-        emission_node_bsdf.inputs['Sheen Tint'].default_value = 0.0
-        emission_node_bsdf.inputs['Clearcoat Roughness'].default_value = 0.0
-        emission_node_bsdf.inputs['Alpha'].default_value = 0.01
-
-        new_bsdf = self.new_node('ShaderNodeBsdfDiffuse', self.make_light_indirect_effect.__name__)
+        light_path_node = self.new_node('ShaderNodeLightPath', self._TAG_LIGHT_INDIRECT_EFFECT)
+        # emission_node = self.new_node('ShaderNodeEmission', self._TAG_LIGHT_INDIRECT_EFFECT)
+        emission_node_bsdf = self.new_node('ShaderNodeBsdfPrincipled', self._TAG_EMISSIVE)
+        apply_emission_bsdf_presets(emission_node_bsdf)
+
+        new_bsdf = self.new_node('ShaderNodeBsdfDiffuse', self._TAG_LIGHT_INDIRECT_EFFECT)
         if emission_color is None:
-            
-            if len(principled_bsdf.inputs["Base Color"].links) == 1:
-                # get the node connected to the Base Color
-                socket_connected_to_the_base_color = principled_bsdf.inputs["Base Color"].links[0].from_socket
+            socket_connected_to_the_base_color = self._base_color_source(principled_bsdf)
+            if socket_connected_to_the_base_color is not None:
                 # self.link(socket_connected_to_the_base_color, emission_node.inputs["Color"])
-                self.link(socket_connected_to_the_base_color, emission_node_bsdf.inputs["Base Color"])
+                self.link(socket_connected_to_the_base_color, get_input_socket(emission_node_bsdf, "Base Color"))
             else:
                 # emission_node.inputs["Color"].default_value = principled_bsdf.inputs["Base Color"].default_value
-                emission_node_bsdf.inputs["Base Color"].default_value = principled_bsdf.inputs["Base Color"].default_value
+                base_color = get_input_socket(principled_bsdf, "Base Color").default_value
+                get_input_socket(emission_node_bsdf, "Base Color").default_value = base_color
         else:
             # emission_node.inputs["Color"].default_value = emission_color
-            emission_node_bsdf.inputs["Emission"].default_value = emission_color
+            get_input_socket(emission_node_bsdf, "Emission").default_value = emission_color
 
         # set the emission strength of the shader
         # emission_node.inputs['Strength'].default_value = emission_strength
-        emission_node_bsdf.inputs['Emission Strength'].default_value = emission_strength
+        get_input_socket(emission_node_bsdf, 'Emission Strength').default_value = emission_strength
         new_bsdf.inputs['Color'].default_value = [0.0, 0.0, 0.0 , 1.0]
 
-        self.unlink(principled_bsdf.outputs['BSDF'], output_node.inputs['Surface'])
-        self.link(new_bsdf.outputs['BSDF'], mix_node1.inputs[2])
-        self.link(principled_bsdf.outputs['BSDF'], mix_node2.inputs[2])
-        self.link(light_path_node.outputs['Ray Depth'], Less_Than.inputs[0])
-        self.link(emission_node_bsdf.outputs['BSDF'], mix_node1.inputs[1])
-        Less_Than.inputs[1].default_value = 2.0
-        self.link(Less_Than.outputs['Value'], mix_node1.inputs['Fac'])
-        self.link(light_path_node.outputs['Is Camera Ray'], mix_node2.inputs['Fac'])
-        self.link(mix_node1.outputs['Shader'], mix_node2.inputs[1])
-        self.link(mix_node2.outputs['Shader'],output_node.inputs['Surface'])
+        self.unlink(get_output_socket(principled_bsdf, 'BSDF'), get_input_socket(output_node, 'Surface'))
+        mix_node1 = self._new_gated_mix_shader(get_output_socket(emission_node_bsdf, 'BSDF'), new_bsdf.outputs['BSDF'],
+                                               light_path_node.outputs['Ray Depth'],
+                                               self._TAG_LIGHT_INDIRECT_EFFECT, threshold=2.0)
+        mix_node2 = self._new_gated_mix_shader(mix_node1.outputs['Shader'], get_output_socket(principled_bsdf, 'BSDF'),
+                                               light_path_node.outputs['Is Camera Ray'],
+                                               self._TAG_LIGHT_INDIRECT_EFFECT)
+        self.link(mix_node2.outputs['Shader'],get_input_socket(output_node, 'Surface'))
 
+    @_with_batched_edits
     def make_indirect_effect_v2(self, ray_length = 1.0):
-        self.remove_emissive()
-        self.remove_transparent()
-        self.remove_transparent_light()
-        self.remove_indirect_effect_v2()
+        self._remove_nodes_created_in_funcs([self._TAG_EMISSIVE, self._TAG_TRANSPARENT,
+                                             self._TAG_TRANSPARENT_LIGHT,
+                                             self._TAG_INDIRECT_EFFECT_V2])
         output_node = self.get_the_one_node_with_type("OutputMaterial")
-        if len(self.get_nodes_with_type("BsdfPrincipled")) == 0:
+        principled_bsdf = self._first_node_of_type("BsdfPrincipled")
+        if principled_bsdf is None:
             return
-        principled_bsdf = self.get_nodes_with_type("BsdfPrincipled")[0]
-
-        mix_node = self.new_node('ShaderNodeMixShader', self.make_indirect_effect_v2.__name__)
-        Compare = self.new_node('ShaderNodeMath', self.make_indirect_effect_v2.__name__)
-        Less_Than = self.new_node('ShaderNodeMath', self.make_indirect_effect_v2.__name__)
-        Greater_Than = self.new_node('ShaderNodeMath', self.make_indirect_effect_v2.__name__)
-        Modulo = self.new_node('ShaderNodeMath', self.make_indirect_effect_v2.__name__)
-        Add = self.new_node('ShaderNodeMath', self.make_indirect_effect_v2.__name__)
-        Multiply = self.new_node('ShaderNodeMath', self.make_indirect_effect_v2.__name__)
-        # Multiply_1 = self.new_node('ShaderNodeMath', self.make_indirect_effect_v2.__name__)
-        light_path_node = self.new_node('ShaderNodeLightPath', self.make_indirect_effect_v2.__name__)
-        transparent_node = self.new_node('ShaderNodeBsdfTransparent', self.make_indirect_effect_v2.__name__)
+
+        Compare = self.new_node(NODE_TYPE_MATH, self._TAG_INDIRECT_EFFECT_V2)
+        Less_Than = self.new_node(NODE_TYPE_MATH, self._TAG_INDIRECT_EFFECT_V2)
+        Greater_Than = self.new_node(NODE_TYPE_MATH, self._TAG_INDIRECT_EFFECT_V2)
+        Modulo = self.new_node(NODE_TYPE_MATH, self._TAG_INDIRECT_EFFECT_V2)
+        Add = self.new_node(NODE_TYPE_MATH, self._TAG_INDIRECT_EFFECT_V2)
+        Multiply = self.new_node(NODE_TYPE_MATH, self._TAG_INDIRECT_EFFECT_V2)
+        # Multiply_1 = self.new_node('ShaderNodeMath', self._TAG_INDIRECT_EFFECT_V2)
+        light_path_node = self.new_node('ShaderNodeLightPath', self._TAG_INDIRECT_EFFECT_V2)
+        transparent_node = self.new_node('ShaderNodeBsdfTransparent', self._TAG_INDIRECT_EFFECT_V2)
 
         Compare.operation = 'COMPARE'
         Less_Than.operation = 'LESS_THAN'
@@ -393,25 +603,24 @@ class Material(Struct):
         Greater_Than.inputs[1].default_value = 0.9
         Modulo.inputs[1].default_value = 2.0
 
-        self.unlink(principled_bsdf.outputs['BSDF'], output_node.inputs['Surface'])
-        self.link(Less_Than.inputs[0], light_path_node.outputs['Ray Length'])
-        self.link(Greater_Than.inputs[0], light_path_node.outputs['Ray Depth'])
-        self.link(Modulo.inputs[0], light_path_node.outputs['Transparent Depth'])
-        self.link(Less_Than.outputs['Value'], Multiply.inputs[0])
-        self.link(Greater_Than.outputs['Value'], Multiply.inputs[1])
-        self.link(Modulo.outputs['Value'], Compare.inputs[0])
-        self.link(Compare.outputs['Value'], Add.inputs[0])
-        self.link(Multiply.outputs['Value'], Add.inputs[1])
-        self.link(Add.outputs['Value'], mix_node.inputs[0])
-
-
-        
-
-        self.link(principled_bsdf.outputs['BSDF'],  mix_node.inputs[1])
-        self.link(transparent_node.outputs['BSDF'], mix_node.inputs[2])
-
-        self.link(mix_node.outputs['Shader'],output_node.inputs['Surface'])
-
+        self.unlink(get_output_socket(principled_bsdf, 'BSDF'), get_input_socket(output_node, 'Surface'))
+        self.link_all([
+            (light_path_node.outputs['Ray Length'], Less_Than.inputs[0]),
+            (light_path_node.outputs['Ray Depth'], Greater_Than.inputs[0]),
+            (light_path_node.outputs['Transparent Depth'], Modulo.inputs[0]),
+            (Less_Than.outputs['Value'], Multiply.inputs[0]),
+            (Greater_Than.outputs['Value'], Multiply.inputs[1]),
+            (Modulo.outputs['Value'], Compare.inputs[0]),
+            (Compare.outputs['Value'], Add.inputs[0]),
+            (Multiply.outputs['Value'], Add.inputs[1])
+        ])
+        mix_node = self._new_gated_mix_shader(get_output_socket(principled_bsdf, 'BSDF'),
+                                              transparent_node.outputs['BSDF'], Add.outputs['Value'],
+                                              self._TAG_INDIRECT_EFFECT_V2)
+
+        self.link(mix_node.outputs['Shader'],get_input_socket(output_node, 'Surface'))
+
+    @_with_batched_edits
     def make_emissive(self, emission_strength: float, replace: bool = False, emission_color: List[float] = None,
                       non_emissive_color_socket: bpy.types.NodeSocket = None):
         """ Makes the material emit light.
@@ -427,54 +636,49 @@ class Material(Struct):
         self.remove_emissive()
 
         output_node = self.get_the_one_node_with_type("OutputMaterial")
+        principled_bsdf = None
 
         if not replace:
-            mix_node = self.new_node('ShaderNodeMixShader', self.make_emissive.__name__)
-            if non_emissive_color_socket is None:
-                principled_bsdf = self.get_nodes_with_type("BsdfPrincipled")[0]
-                non_emissive_color_socket = principled_bsdf.outputs['BSDF']
-            self.insert_node_instead_existing_link(non_emissive_color_socket, mix_node.inputs[2],
-                                                   mix_node.outputs['Shader'], output_node.inputs['Surface'])
-
             # The light path node returns 1, if the material is hit by a ray coming from the camera, else it
             # returns 0. In this way the mix shader will use the principled shader for rendering the color of
             # the emitting surface itself, while using the emission shader for lighting the scene.
-            light_path_node = self.new_node('ShaderNodeLightPath', self.make_emissive.__name__)
-            self.link(light_path_node.outputs['Is Camera Ray'], mix_node.inputs['Fac'])
+            light_path_node = self.new_node('ShaderNodeLightPath', self._TAG_EMISSIVE)
+            mix_node = self._new_gated_mix_shader(None, None, light_path_node.outputs['Is Camera Ray'],
+                                                  self._TAG_EMISSIVE)
+            if non_emissive_color_socket is None:
+                principled_bsdf = self._first_node_of_type("BsdfPrincipled")
+                non_emissive_color_socket = get_output_socket(principled_bsdf, 'BSDF')
+            self.insert_node_instead_existing_link(non_emissive_color_socket, mix_node.inputs[2],
+                                                   mix_node.outputs['Shader'], get_input_socket(output_node, 'Surface'))
             output_socket = mix_node.inputs[1]
         else:
-            output_socket = output_node.inputs['Surface']
-
-        # emission_node = self.new_node('ShaderNodeEmission', self.make_emissive.__name__)
-        emission_node_bsdf = self.new_node('ShaderNodeBsdfPrincipled', self.make_emissive.__name__)
-            # Subsurface IOR
-        emission_node_bsdf.inputs['Subsurface'].default_value = 0.0
-        emission_node_bsdf.inputs['Specular'].default_value = 0.0
-        emission_node_bsdf.inputs['Roughness'].default_value = 0.0
-        emission_node_bsdf.inputs['Sheen Tint'].default_value = 0.0
-        emission_node_bsdf.inputs['Clearcoat Roughness'].default_value = 0.0
-        emission_node_bsdf.inputs['Alpha'].default_value = 0.01
+            output_socket = get_input_socket(output_node, 'Surface')
+
+        # emission_node = self.new_node('ShaderNodeEmission', self._TAG_EMISSIVE)
+        emission_node_bsdf = self.new_node('ShaderNodeBsdfPrincipled', self._TAG_EMISSIVE)
+        apply_emission_bsdf_presets(emission_node_bsdf)
 
         if emission_color is None:
-            principled_bsdf = self.get_nodes_with_type("BsdfPrincipled")[0]
+            if principled_bsdf is None:
+                principled_bsdf = self._first_node_of_type("BsdfPrincipled")
 
-            if len(principled_bsdf.inputs["Base Color"].links) == 1:
-                # get the node connected to the Base Color
-                socket_connected_to_the_base_color = principled_bsdf.inputs["Base Color"].links[0].from_socket
-                self.link(socket_connected_to_the_base_color, emission_node_bsdf.inputs["Base Color"])
+            socket_connected_to_the_base_color = self._base_color_source(principled_bsdf)
+            if socket_connected_to_the_base_color is not None:
+                self.link(socket_connected_to_the_base_color, get_input_socket(emission_node_bsdf, "Base Color"))
                 # self.link(socket_connected_to_the_base_color, emission_node.inputs["Color"])
             else:
                 # emission_node.inputs["Color"].default_value = principled_bsdf.inputs["Base Color"].default_value
-                emission_node_bsdf.inputs["Base Color"].default_value = principled_bsdf.inputs["Base Color"].default_value
+                base_color = get_input_socket(principled_bsdf, "Base Color").default_value
+                get_input_socket(emission_node_bsdf, "Base Color").default_value = base_color
         else:
-            emission_node_bsdf.inputs['Emission'].default_value = emission_color
+            get_input_socket(emission_node_bsdf, 'Emission').default_value = emission_color
             # emission_node.inputs["Color"].default_value = emission_color
 
         # set the emission strength of the shader
-        emission_node_bsdf.inputs['Emission Strength'].default_value = emission_strength
+        get_input_socket(emission_node_bsdf, 'Emission Strength').default_value = emission_strength
         # emission_node.inputs['Strength'].default_value = emission_strength
 
-        self.link(emission_node_bsdf.outputs["BSDF"], output_socket)
+        self.link(get_output_socket(emission_node_bsdf, "BSDF"), output_socket)
         # self.link(emission_node.outputs["Emission"], output_socket)
 
     def set_principled_shader_value(self, input_name: str, value: Union[float, bpy.types.Image, bpy.types.NodeSocket]):
@@ -486,18 +690,47 @@ class Material(Struct):
                       the input.
         """
         principled_bsdf = self.get_the_one_node_with_type("BsdfPrincipled")
-
-        if isinstance(value, bpy.types.Image):
-            node = self.new_node('ShaderNodeTexImage')
-            node.label = input_name
-            node.image = value
-            self.link(node.outputs['Color'], principled_bsdf.inputs[input_name])
-        elif isinstance(value, bpy.types.NodeSocket):
-            self.link(value, principled_bsdf.inputs[input_name])
-        else:
-            if principled_bsdf.inputs[input_name].links:
-                self.links.remove(principled_bsdf.inputs[input_name].links[0])
-            principled_bsdf.inputs[input_name].default_value = value
+        value_type = type(value)
+        setter = Material._PRINCIPLED_VALUE_SETTERS.get(value_type)
+        if setter is None:
+            # the exact type is not known yet (e.g. a specific socket type), so resolve it once via its base classes
+            setter = Material._set_principled_input_to_default_value
+            for base_type in Material._PRINCIPLED_BASE_TYPES:
+                if issubclass(value_type, base_type):
+                    setter = Material._PRINCIPLED_VALUE_SETTERS[base_type]
+                    break
+            Material._PRINCIPLED_VALUE_SETTERS[value_type] = setter
+        setter(self, principled_bsdf.inputs[input_name], input_name, value)
+
+    def _set_principled_input_to_image(self, principled_input: bpy.types.NodeSocket, input_name: str,
+                                       value: bpy.types.Image):
+        """ Connects a new image texture node using the given image to the given input of the principled shader. """
+        node = self.new_node(NODE_TYPE_TEX_IMAGE)
+        node.label = input_name
+        node.image = value
+        self.link(node.outputs['Color'], principled_input)
+
+    def _set_principled_input_to_socket(self, principled_input: bpy.types.NodeSocket, input_name: str,
+                                        value: bpy.types.NodeSocket):
+        """ Connects the given socket to the given input of the principled shader. """
+        # pylint: disable=unused-argument
+        self.link(value, principled_input)
+
+    def _set_principled_input_to_default_value(self, principled_input: bpy.types.NodeSocket, input_name: str,
+                                               value: float):
+        """ Removes the link to the given input of the principled shader and sets its default value. """
+        # pylint: disable=unused-argument
+        links_to_input = self.get_links_to_socket(principled_input)
+        if links_to_input:
+            self.links.remove(links_to_input[0])
+        principled_input.default_value = value
+
+    # the types handled by set_principled_shader_value, their subclasses are added to the setters on first use
+    _PRINCIPLED_BASE_TYPES = (bpy.types.Image, bpy.types.NodeSocket)
+    _PRINCIPLED_VALUE_SETTERS = {
+        bpy.types.Image: _set_principled_input_to_image,
+        bpy.types.NodeSocket: _set_principled_input_to_socket
+    }
 
     def get_principled_shader_value(self, input_name: str) -> Union[float, bpy.types.NodeSocket]:
         """
@@ -510,7 +743,7 @@ class Material(Struct):
         # get the one node from type Principled BSDF
         principled_bsdf = self.get_the_one_node_with_type("BsdfPrincipled")
         # check if the input name is a valid input
-        if input_name in principled_bsdf.inputs:
+        if input_name in get_input_names(principled_bsdf):
             # check if there are any connections to this input socket
             if principled_bsdf.inputs[input_name].links:
                 if len(principled_bsdf.inputs[input_name].links) == 1:
@@ -528,16 +761,17 @@ class Material(Struct):
         removes the connection between this node and the output and returns this node and the material_output
         """
         material_output = self.get_the_one_node_with_type('OutputMaterial')
-        # find the node, which is connected to the output
-        node_connected_to_the_output = None
-        for link in self.links:
-            if link.to_node == material_output:
-                node_connected_to_the_output = link.from_node
-                # remove this link
-                self.links.remove(link)
-                break
+        # find the node, which is connected to the surface of the output
+        surface_input = get_input_socket(material_output, 'Surface')
+        links_to_surface = self.get_links_to_socket(surface_input)
+        if not links_to_surface:
+            return None, material_output
+        node_connected_to_the_output = links_to_surface[0].from_node
+        # remove this link
+        self.links.remove(links_to_surface[0])
         return node_connected_to_the_output, material_output
 
+    @_with_batched_edits
     def infuse_texture(self, texture: bpy.types.Texture, mode: str = "overlay", connection: str = "Base Color",
                        texture_scale: float = 0.05, strength: float = 0.5, invert_texture: bool = False):
         """ Overlays the selected material with a texture, this can be either a color texture like for example dirt or
@@ -558,50 +792,107 @@ class Material(Struct):
                                setting this to True.
         """
         used_mode = mode.lower()
-        if used_mode not in ["overlay", "mix", "set"]:
-            raise Exception(f'This mode is unknown here: {used_mode}, only ["overlay", "mix", "set"]!')
-
-        used_connector = connection.title()
+        if used_mode not in INFUSE_TEXTURE_MODES:
+            raise Exception(f'This mode is unknown here: {used_mode}, only {list(INFUSE_TEXTURE_MODES)}!')
 
         principled_bsdf = self.get_the_one_node_with_type("BsdfPrincipled")
-        if used_connector not in principled_bsdf.inputs:
+        principled_input_names = get_input_names(principled_bsdf)
+        # only fall back to the title case, if the given name is not already an input name, e.g. for "IOR"
+        used_connector = connection if connection in principled_input_names else connection.title()
+        if used_connector not in principled_input_names:
             raise Exception(f"The {used_connector} is not an input to Principled BSDF!")
+        principled_input = get_input_socket(principled_bsdf, used_connector)
+
+        if used_mode != "set" and strength == 0.0:
+            # a mix with a factor of zero only returns the existing input, so the material stays as it is
+            return
+        # a mix with a factor of one only returns the texture, which is the same as setting it
+        replace_input = used_mode == "set" or (used_mode == "mix" and strength == 1.0)
+
+        prior_links = self.get_links_to_socket(principled_input)
+        node_socket_connected_to_the_connector = prior_links[-1].from_socket if prior_links else None
+        # decide the resulting topology first, so that only nodes which end up connected to the output are created
+        if node_socket_connected_to_the_connector is None and used_mode != "set":
+            # only "set" adds the texture to an input, which is not linked yet
+            return
+        mix_with_existing_input = not replace_input
+        # the existing link does not have to be removed, as the inputs of the principled bsdf only take one link,
+        # the new link created below replaces it
+
+        texture_node_output = self._new_texture_output(texture, texture_scale, invert_texture)
+        if mix_with_existing_input:
+            mix_node = self.new_node(NODE_TYPE_MIX_RGB)
+            mix_node.blend_type = INFUSE_TEXTURE_BLEND_TYPES[used_mode]
+            mix_inputs = mix_node.inputs
+            mix_inputs["Fac"].default_value = strength
+            self.link(texture_node_output, mix_inputs["Color2"])
+            # hopefully 0 is the color node!
+            self.link(node_socket_connected_to_the_connector, mix_inputs["Color1"])
+            self.link(mix_node.outputs["Color"], principled_input)
+        else:
+            self.link(texture_node_output, principled_input)
+
+    def _new_texture_output(self, texture: bpy.types.Texture, texture_scale: float,
+                            invert_texture: bool) -> bpy.types.NodeSocket:
+        """ Creates the nodes which sample the given texture with scaled uv coordinates.
 
-        node_socket_connected_to_the_connector = None
-        for link in principled_bsdf.inputs[used_connector].links:
-            node_socket_connected_to_the_connector = link.from_socket
-            # remove this connection
-            self.links.remove(link)
-        if node_socket_connected_to_the_connector is not None or used_mode == "set":
-            texture_node = self.new_node("ShaderNodeTexImage")
-            texture_node.image = texture.image
+        :param texture: The texture whose image should be sampled.
+        :param texture_scale: The scale of the uv coordinates.
+        :param invert_texture: If True, the color of the texture is inverted.
+        :return: The output socket of the sampled and optionally inverted color.
+        """
+        texture_node = self.new_node(NODE_TYPE_TEX_IMAGE)
+        texture_node.image = texture.image
+        if texture_scale == 1.0:
+            # the mapping would be an identity transformation, so the uv coordinates can be used directly
+            texture_coords = self._get_shared_texture_coords()
+            self.link(texture_coords.outputs["UV"], texture_node.inputs["Vector"])
+        else:
             # add texture coords to make the scaling of the dust texture possible
-            texture_coords = self.new_node("ShaderNodeTexCoord")
-            mapping_node = self.new_node("ShaderNodeMapping")
-            mapping_node.vector_type = "TEXTURE"
-            mapping_node.inputs["Scale"].default_value = [texture_scale] * 3
-            self.link(texture_coords.outputs["UV"], mapping_node.inputs["Vector"])
+            mapping_node = self._get_shared_mapping_node(texture_scale)
             self.link(mapping_node.outputs["Vector"], texture_node.inputs["Vector"])
-            texture_node_output = texture_node.outputs["Color"]
-            if invert_texture:
-                invert_node = self.new_node("ShaderNodeInvert")
-                invert_node.inputs["Fac"].default_value = 1.0
-                self.link(texture_node_output, invert_node.inputs["Color"])
-                texture_node_output = invert_node.outputs["Color"]
-            if node_socket_connected_to_the_connector is not None and used_mode != "set":
-                mix_node = self.new_node("ShaderNodeMixRGB")
-                if used_mode in "mix_node":
-                    mix_node.blend_type = "OVERLAY"
-                elif used_mode in "mix":
-                    mix_node.blend_type = "MIX"
-                mix_node.inputs["Fac"].default_value = strength
-                self.link(texture_node_output, mix_node.inputs["Color2"])
-                # hopefully 0 is the color node!
-                self.link(node_socket_connected_to_the_connector, mix_node.inputs["Color1"])
-                self.link(mix_node.outputs["Color"], principled_bsdf.inputs[used_connector])
-            elif used_mode == "set":
-                self.link(texture_node_output, principled_bsdf.inputs[used_connector])
+        texture_node_output = texture_node.outputs["Color"]
+        if invert_texture:
+            invert_node = self.new_node(NODE_TYPE_INVERT)
+            invert_node.inputs["Fac"].default_value = 1.0
+            self.link(texture_node_output, invert_node.inputs["Color"])
+            texture_node_output = invert_node.outputs["Color"]
+        return texture_node_output
+
+    def _get_shared_texture_coords(self) -> bpy.types.Node:
+        """ Returns the texture coordinate node shared between all textures infused into this material.
+
+        :return: The texture coordinate node, it is created if it does not exist yet.
+        """
+        texture_coords_nodes = self.get_nodes_with_type(NODE_TYPE_TEX_COORD, self._TAG_INFUSE_TEXTURE)
+        if texture_coords_nodes:
+            return texture_coords_nodes[0]
+        return self.new_node(NODE_TYPE_TEX_COORD, self._TAG_INFUSE_TEXTURE)
 
+    def _get_shared_mapping_node(self, texture_scale: float) -> bpy.types.Node:
+        """ Returns a mapping node, which scales the uv coordinates by the given scale.
+
+        The texture coordinate node and the mapping nodes are shared between all textures infused into this
+        material, so a new mapping node is only created for a scale which has not been used before.
+
+        :param texture_scale: The scale of the uv coordinates.
+        :return: The mapping node.
+        """
+        # near equal scales are treated as the same scale
+        scale_key = round(texture_scale, 6)
+        for mapping_node in self.get_nodes_with_type(NODE_TYPE_MAPPING, self._TAG_INFUSE_TEXTURE):
+            if all(round(value, 6) == scale_key for value in mapping_node.inputs["Scale"].default_value):
+                return mapping_node
+
+        texture_coords = self._get_shared_texture_coords()
+        mapping_node = self.new_node(NODE_TYPE_MAPPING, self._TAG_INFUSE_TEXTURE)
+        mapping_node.vector_type = "TEXTURE"
+        mapping_inputs = mapping_node.inputs
+        mapping_inputs["Scale"].default_value = (texture_scale, texture_scale, texture_scale)
+        self.link(texture_coords.outputs["UV"], mapping_inputs["Vector"])
+        return mapping_node
+
+    @_with_batched_edits
     def infuse_material(self, material: "Material", mode: str = "mix", mix_strength: float = 0.5):
         """
         Infuse a material inside another material. The given material, will be adapted and the used material, will
@@ -618,51 +909,62 @@ class Material(Struct):
         """
         # determine the mode
         used_mode = mode.lower()
-        if used_mode not in ["add", "mix"]:
-            raise Exception(f'This mode is unknown here: {used_mode}, only ["mix", "add"]!')
+        if used_mode not in INFUSE_MATERIAL_MODES:
+            raise Exception(f'This mode is unknown here: {used_mode}, only {list(INFUSE_MATERIAL_MODES)}!')
+        if used_mode == "mix" and mix_strength == 0.0:
+            # with a strength of zero, all mix and multiply nodes would only return the existing material
+            return
 
         # move the copied material inside of a group
-        group_node = self.new_node("ShaderNodeGroup")
-        group = BlenderUtility.add_nodes_to_group(material.nodes,
-                                                  f"{used_mode.title()}_{material.get_name()}")
-        group_node.node_tree = group
+        group_node = self.new_node(NODE_TYPE_GROUP)
+        group_node.node_tree = BlenderUtility.add_nodes_to_group(material.nodes,
+                                                                 f"{used_mode.title()}_{material.get_name()}")
         # get the current material output and put the used material in between the last node and the material output
         material_output = self.get_the_one_node_with_type("OutputMaterial")
-        for mat_output_input in material_output.inputs:
-            if len(mat_output_input.links) > 0:
-                if "Float" in mat_output_input.bl_idname or "Vector" in mat_output_input.bl_idname:
-                    # For displacement
-                    infuse_node = self.new_node("ShaderNodeMixRGB")
-                    if used_mode == "mix":
-                        # as there is no mix mode, we use multiply here, which is similar
-                        infuse_node.blend_type = "MULTIPLY"
-                        infuse_node.inputs["Fac"].default_value = mix_strength
-                        input_offset = 1
-                    elif used_mode == "add":
-                        infuse_node.blend_type = "ADD"
-                        input_offset = 0
-                    else:
-                        raise Exception(f"This mode is not supported here: {used_mode}!")
-                    infuse_output = infuse_node.outputs["Color"]
-                else:
-                    # for the normal surface output (Color)
-                    if used_mode == "mix":
-                        infuse_node = self.new_node('ShaderNodeMixShader')
-                        infuse_node.inputs[0].default_value = mix_strength
-                        input_offset = 1
-                    elif used_mode == "add":
-                        infuse_node = self.new_node('ShaderNodeMixShader')
-                        input_offset = 0
-                    else:
-                        raise Exception(f"This mode is not supported here: {used_mode}!")
-                    infuse_output = infuse_node.outputs["Shader"]
-
-                # link the infuse node with the correct group node and the material output
-                for link in mat_output_input.links:
-                    self.link(link.from_socket, infuse_node.inputs[input_offset])
-                self.link(group_node.outputs[mat_output_input.name], infuse_node.inputs[input_offset + 1])
-                self.link(infuse_output, mat_output_input)
-
+        # collect the connected inputs and their sources first, before the node tree is changed
+        connected_inputs = self._get_connected_inputs(material_output)
+
+        # a mix shader with a factor of one only returns the infused material
+        replace_shader_inputs = used_mode == "mix" and mix_strength == 1.0
+        socket_pairs = []
+        for mat_output_input, from_sockets in connected_inputs:
+            group_output = group_node.outputs.get(mat_output_input.name)
+            if group_output is None:
+                # the infused material has nothing to offer for this output
+                continue
+            # value and vector inputs like the displacement are combined via color math, the rest via shaders
+            is_data_input = mat_output_input.type in ('VALUE', 'VECTOR')
+            if replace_shader_inputs and not is_data_input:
+                # the multiply used for value and vector inputs still depends on the existing input
+                socket_pairs.append((group_output, mat_output_input))
+                continue
+            infuse_node_factory = INFUSE_MATERIAL_NODE_FACTORIES[(is_data_input, used_mode)]
+            infuse_node, infuse_output, input_offset = infuse_node_factory(self, mix_strength)
+
+            # link the infuse node with the correct group node and the material output
+            infuse_inputs = infuse_node.inputs
+            existing_input = infuse_inputs[input_offset]
+            for from_socket in from_sockets:
+                socket_pairs.append((from_socket, existing_input))
+            socket_pairs.append((group_output, infuse_inputs[input_offset + 1]))
+            socket_pairs.append((infuse_output, mat_output_input))
+        self.link_all(socket_pairs)
+
+    def _get_connected_inputs(self, node: bpy.types.Node) -> List[Tuple[bpy.types.NodeSocket,
+                                                                         List[bpy.types.NodeSocket]]]:
+        """ Returns all linked inputs of the given node together with the sockets linked to them.
+
+        :param node: The node whose inputs should be checked.
+        :return: A list of (input socket, list of source sockets) tuples, in the order of the inputs.
+        """
+        connected_inputs = []
+        for node_input in node.inputs:
+            links_to_input = self.get_links_to_socket(node_input)
+            if links_to_input:
+                connected_inputs.append((node_input, [link.from_socket for link in links_to_input]))
+        return connected_inputs
+
+    @_with_batched_edits
     def set_displacement_from_principled_shader_value(self, input_name: str, multiply_factor: float):
         """ Connects the node that is connected to the specified input of the principled shader node
         with the displacement output of the material.
@@ -675,18 +977,20 @@ class Material(Struct):
         if not isinstance(input_socket, bpy.types.NodeSocket):
             raise Exception(f"The input {input_name} of the principled shader does not have any incoming connection.")
 
-        # Create multiplication node and connect with retrieved socket
-        math_node = self.new_node('ShaderNodeMath')
-        math_node.operation = "MULTIPLY"
-        math_node.inputs[1].default_value = multiply_factor
-        self.link(input_socket, math_node.inputs[0])
+        if multiply_factor != 1.0:
+            # Create multiplication node and connect with retrieved socket
+            math_node = self.new_node(NODE_TYPE_MATH)
+            math_node.operation = "MULTIPLY"
+            math_node.inputs[1].default_value = multiply_factor
+            self.link(input_socket, math_node.inputs[0])
+            input_socket = math_node.outputs["Value"]
 
-        # Connect multiplication node with displacement output
+        # Connect the (multiplied) socket with displacement output
         output = self.get_the_one_node_with_type("OutputMaterial")
-        self.link(math_node.outputs["Value"], output.inputs["Displacement"])
+        self.link(input_socket, get_input_socket(output, "Displacement"))
 
     def __setattr__(self, key, value):
-        if key not in ["links", "nodes", "blender_obj"]:
+        if key not in Material._SETTABLE_ATTRIBUTES:
             raise RuntimeError("The API class does not allow setting any attribute. Use the corresponding method or "
                                "directly access the blender attribute via entity.blender_obj.attribute_name")
         object.__setattr__(self, key, value)
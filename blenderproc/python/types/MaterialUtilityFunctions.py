@@ -0,0 +1,174 @@
+""" Material utility functions, like cached socket lookups and the node factories used by the Material class. """
+
+import sys
+from typing import Dict, FrozenSet, Tuple
+
+import bpy
+
+# the types of the nodes created by the Material class
+NODE_TYPE_TEX_IMAGE = sys.intern("ShaderNodeTexImage")
+NODE_TYPE_TEX_COORD = sys.intern("ShaderNodeTexCoord")
+NODE_TYPE_MAPPING = sys.intern("ShaderNodeMapping")
+NODE_TYPE_INVERT = sys.intern("ShaderNodeInvert")
+NODE_TYPE_MIX_RGB = sys.intern("ShaderNodeMixRGB")
+NODE_TYPE_GROUP = sys.intern("ShaderNodeGroup")
+NODE_TYPE_MATH = sys.intern("ShaderNodeMath")
+NODE_TYPE_MIX_SHADER = sys.intern("ShaderNodeMixShader")
+
+# input values of the principled bsdf, which is used to emit light in make_emissive and make_light_indirect_effect
+_EMISSION_BSDF_PRESETS = (
+    ('Subsurface', 0.0),
+    ('Specular', 0.0),
+    ('Roughness', 0.0),
+    ('Sheen Tint', 0.0),
+    ('Clearcoat Roughness', 0.0),
+    ('Alpha', 0.01)
+)
+
+
+# maps (bl_idname, is_output, socket name) to the index of the socket, the sockets of a node type never change
+_SOCKET_INDICES: Dict[Tuple[str, bool, str], int] = {}
+
+
+def _get_socket(node: bpy.types.Node, name: str, is_output: bool) -> bpy.types.NodeSocket:
+    """ Returns the socket with the given name, its index is only searched on the first access per node type.
+
+    Must not be used for nodes whose sockets depend on the node itself, like group nodes.
+
+    :param node: The node containing the socket.
+    :param name: The name of the socket.
+    :param is_output: If True, the socket is searched in the outputs, else in the inputs.
+    :return: The socket.
+    """
+    sockets = node.outputs if is_output else node.inputs
+    key = (node.bl_idname, is_output, name)
+    index = _SOCKET_INDICES.get(key)
+    if index is None:
+        index = sockets.find(name)
+        if index < 0:
+            raise KeyError(f"The node {node.name} has no {'output' if is_output else 'input'} named: {name}")
+        _SOCKET_INDICES[key] = index
+    return sockets[index]
+
+
+# maps the bl_idname of a node type to the names of its inputs, like the socket indices they never change
+_INPUT_NAMES: Dict[str, FrozenSet[str]] = {}
+
+
+def get_input_names(node: bpy.types.Node) -> FrozenSet[str]:
+    """ Returns the names of all inputs of the given node, they are only read once per node type.
+
+    Must not be used for nodes whose sockets depend on the node itself, like group nodes.
+
+    :param node: The node whose input names should be returned.
+    :return: The set of input names.
+    """
+    bl_idname = node.bl_idname
+    input_names = _INPUT_NAMES.get(bl_idname)
+    if input_names is None:
+        input_names = frozenset(node_input.name for node_input in node.inputs)
+        _INPUT_NAMES[bl_idname] = input_names
+    return input_names
+
+
+def get_input_socket(node: bpy.types.Node, name: str) -> bpy.types.NodeSocket:
+    """ Returns the input socket with the given name, see _get_socket.
+
+    :param node: The node containing the socket.
+    :param name: The name of the input socket.
+    :return: The input socket.
+    """
+    return _get_socket(node, name, False)
+
+
+def get_output_socket(node: bpy.types.Node, name: str) -> bpy.types.NodeSocket:
+    """ Returns the output socket with the given name, see _get_socket.
+
+    :param node: The node containing the socket.
+    :param name: The name of the output socket.
+    :return: The output socket.
+    """
+    return _get_socket(node, name, True)
+
+
+def apply_emission_bsdf_presets(node: bpy.types.Node):
+    """ Sets the inputs of the given principled bsdf to the values of the emission preset.
+
+    :param node: The principled bsdf node used for the emission.
+    """
+    for input_name, value in _EMISSION_BSDF_PRESETS:
+        get_input_socket(node, input_name).default_value = value
+
+
+# an infuse node of infuse_material, its output socket and the index of its first input taking the values to combine
+_InfuseNode = Tuple[bpy.types.Node, bpy.types.NodeSocket, int]
+
+
+def _new_multiply_infuse_node(material: "Material", mix_strength: float) -> _InfuseNode:
+    """ Creates the node infusing a value or vector input in the "mix" mode of infuse_material.
+
+    :param material: The material the node is created in.
+    :param mix_strength: The strength of the infused material.
+    :return: The node, its output socket and the index of its first input which takes the values to combine.
+    """
+    infuse_node = material.new_node(NODE_TYPE_MIX_RGB)
+    # as there is no mix mode, we use multiply here, which is similar
+    infuse_node.blend_type = "MULTIPLY"
+    infuse_node.inputs["Fac"].default_value = mix_strength
+    return infuse_node, infuse_node.outputs["Color"], 1
+
+
+def _new_add_infuse_node(material: "Material", mix_strength: float) -> _InfuseNode:
+    """ Creates the node infusing a value or vector input in the "add" mode of infuse_material.
+
+    :param material: The material the node is created in.
+    :param mix_strength: Not used in this mode.
+    :return: The node, its output socket and the index of its first input which takes the values to combine.
+    """
+    # pylint: disable=unused-argument
+    infuse_node = material.new_node(NODE_TYPE_MIX_RGB)
+    infuse_node.blend_type = "ADD"
+    return infuse_node, infuse_node.outputs["Color"], 0
+
+
+def _new_mix_shader_infuse_node(material: "Material", mix_strength: float) -> _InfuseNode:
+    """ Creates the node infusing a shader input in the "mix" mode of infuse_material.
+
+    :param material: The material the node is created in.
+    :param mix_strength: The strength of the infused material.
+    :return: The node, its output socket and the index of its first input which takes the shaders to combine.
+    """
+    infuse_node = material.new_node(NODE_TYPE_MIX_SHADER)
+    infuse_node.inputs[0].default_value = mix_strength
+    return infuse_node, infuse_node.outputs["Shader"], 1
+
+
+def _new_add_shader_infuse_node(material: "Material", mix_strength: float) -> _InfuseNode:
+    """ Creates the node infusing a shader input in the "add" mode of infuse_material.
+
+    :param material: The material the node is created in.
+    :param mix_strength: Not used in this mode.
+    :return: The node, its output socket and the index of its first input which takes the shaders to combine.
+    """
+    # pylint: disable=unused-argument
+    infuse_node = material.new_node(NODE_TYPE_MIX_SHADER)
+    return infuse_node, infuse_node.outputs["Shader"], 0
+
+
+# maps (is a value or vector input, mode) to the function creating the infuse node for an input of the material output
+INFUSE_MATERIAL_NODE_FACTORIES = {
+    (True, "mix"): _new_multiply_infuse_node,
+    (True, "add"): _new_add_infuse_node,
+    (False, "mix"): _new_mix_shader_infuse_node,
+    (False, "add"): _new_add_shader_infuse_node
+}
+# the modes of infuse_material, derived from the factories so that both can not diverge
+INFUSE_MATERIAL_MODES = tuple(dict.fromkeys(mode for _, mode in INFUSE_MATERIAL_NODE_FACTORIES))
+
+# maps the modes of infuse_texture, which mix the texture with the existing input, to the used blend type
+INFUSE_TEXTURE_BLEND_TYPES = {
+    "overlay": "OVERLAY",
+    "mix": "MIX"
+}
+# the modes of infuse_texture, "set" replaces the existing input and does not need a blend type
+INFUSE_TEXTURE_MODES = tuple(INFUSE_TEXTURE_BLEND_TYPES) + ("set",)
@@ -0,0 +1,140 @@
+import blenderproc as bproc
+
+import unittest
+
+import bpy
+
+
+class UnitTestCheckMaterial(unittest.TestCase):
+
+    def test_get_links_to_socket_after_replaced_link(self):
+        """ Test that a link replaced directly via the blender links is found by get_links_to_socket.
+        """
+        bproc.clean_up(True)
+        material = bproc.material.create("test_material")
+        principled_bsdf = material.get_the_one_node_with_type("BsdfPrincipled")
+        base_color = principled_bsdf.inputs["Base Color"]
+
+        first_node = material.new_node("ShaderNodeRGB")
+        material.link(first_node.outputs["Color"], base_color)
+        self.assertEqual(len(material.get_links_to_socket(base_color)), 1)
+
+        # replace the link without changing the number of links in the node tree
+        second_node = material.new_node("ShaderNodeRGB")
+        material.links.new(second_node.outputs["Color"], base_color)
+
+        links = material.get_links_to_socket(base_color)
+        self.assertEqual(len(links), 1)
+        self.assertEqual(links[0].from_node, second_node)
+
+        material.unlink(second_node.outputs["Color"], base_color)
+        self.assertEqual(material.get_links_to_socket(base_color), [])
+
+    def test_get_nodes_with_type_after_replaced_node(self):
+        """ Test that a node replaced directly via the blender nodes is not returned by get_nodes_with_type.
+        """
+        bproc.clean_up(True)
+        material = bproc.material.create("test_material")
+        first_node = material.new_node("ShaderNodeRGB")
+        self.assertEqual(material.get_nodes_with_type("ShaderNodeRGB"), [first_node])
+
+        # replace the node without changing the number of nodes in the node tree
+        material.nodes.remove(first_node)
+        second_node = material.nodes.new("ShaderNodeRGB")
+
+        self.assertEqual(material.get_nodes_with_type("ShaderNodeRGB"), [second_node])
+        self.assertEqual(material.get_the_one_node_with_type("ShaderNodeRGB"), second_node)
+
+    @staticmethod
+    def _create_image_texture() -> bpy.types.Texture:
+        """ Creates an image texture, which can be infused into a material.
+        """
+        texture = bpy.data.textures.new("test_texture", "IMAGE")
+        texture.image = bpy.data.images.new("test_image", 4, 4)
+        return texture
+
+    def test_infuse_texture_mix_full_strength_without_link(self):
+        """ Test that mixing a texture with full strength into an unlinked input does not change the material.
+        """
+        bproc.clean_up(True)
+        material = bproc.material.create("test_material")
+        principled_bsdf = material.get_the_one_node_with_type("BsdfPrincipled")
+        node_count = len(material.nodes)
+
+        material.infuse_texture(self._create_image_texture(), mode="mix", strength=1.0)
+
+        self.assertEqual(len(material.nodes), node_count)
+        self.assertFalse(principled_bsdf.inputs["Base Color"].is_linked)
+
+    def test_infuse_texture_mix_full_strength_with_link(self):
+        """ Test that mixing a texture with full strength into a linked input replaces the existing link.
+        """
+        bproc.clean_up(True)
+        material = bproc.material.create("test_material")
+        principled_bsdf = material.get_the_one_node_with_type("BsdfPrincipled")
+        base_color = principled_bsdf.inputs["Base Color"]
+        rgb_node = material.new_node("ShaderNodeRGB")
+        material.link(rgb_node.outputs["Color"], base_color)
+
+        material.infuse_texture(self._create_image_texture(), mode="mix", strength=1.0)
+
+        links = material.get_links_to_socket(base_color)
+        self.assertEqual(len(links), 1)
+        self.assertEqual(links[0].from_node.bl_idname, "ShaderNodeTexImage")
+        self.assertEqual(material.get_nodes_with_type("ShaderNodeMixRGB"), [])
+
+    def test_infuse_texture_blend_types(self):
+        """ Test that the overlay and mix modes of infuse_texture use the matching blend type.
+        """
+        for mode, blend_type in [("overlay", "OVERLAY"), ("mix", "MIX")]:
+            bproc.clean_up(True)
+            material = bproc.material.create("test_material")
+            principled_bsdf = material.get_the_one_node_with_type("BsdfPrincipled")
+            base_color = principled_bsdf.inputs["Base Color"]
+            rgb_node = material.new_node("ShaderNodeRGB")
+            material.link(rgb_node.outputs["Color"], base_color)
+
+            material.infuse_texture(self._create_image_texture(), mode=mode, strength=0.5)
+
+            mix_node = material.get_the_one_node_with_type("ShaderNodeMixRGB")
+            self.assertEqual(mix_node.blend_type, blend_type)
+            self.assertEqual(material.get_links_to_socket(base_color)[0].from_node, mix_node)
+            self.assertEqual(material.get_links_to_socket(mix_node.inputs["Color1"])[0].from_node, rgb_node)
+            self.assertEqual(material.get_links_to_socket(mix_node.inputs["Color2"])[0].from_node.bl_idname,
+                             "ShaderNodeTexImage")
+
+    def test_make_indirect_effect_v2_light_path_links(self):
+        """ Test that make_indirect_effect_v2 links the light path outputs into the math nodes.
+        """
+        bproc.clean_up(True)
+        material = bproc.material.create("test_material")
+        material.make_indirect_effect_v2(ray_length=2.0)
+
+        light_path_node = material.get_the_one_node_with_type("LightPath")
+        for output_name, operation in [("Ray Length", "LESS_THAN"), ("Ray Depth", "GREATER_THAN"),
+                                       ("Transparent Depth", "MODULO")]:
+            links = [link for link in material.links if link.from_socket == light_path_node.outputs[output_name]]
+            self.assertEqual(len(links), 1)
+            self.assertEqual(links[0].to_node.bl_idname, "ShaderNodeMath")
+            self.assertEqual(links[0].to_node.operation, operation)
+
+        output_node = material.get_the_one_node_with_type("OutputMaterial")
+        surface_links = material.get_links_to_socket(output_node.inputs["Surface"])
+        self.assertEqual(surface_links[0].from_node.bl_idname, "ShaderNodeMixShader")
+
+    def test_unlink(self):
+        """ Test that unlink only removes the link between the given sockets.
+        """
+        bproc.clean_up(True)
+        material = bproc.material.create("test_material")
+        principled_bsdf = material.get_the_one_node_with_type("BsdfPrincipled")
+        output_node = material.get_the_one_node_with_type("OutputMaterial")
+        surface = output_node.inputs["Surface"]
+        other_node = material.new_node("ShaderNodeBsdfTransparent")
+
+        # a link from another source must not be removed
+        material.unlink(other_node.outputs["BSDF"], surface)
+        self.assertEqual(material.get_links_to_socket(surface)[0].from_node, principled_bsdf)
+
+        material.unlink(principled_bsdf.outputs["BSDF"], surface)
+        self.assertFalse(surface.is_linked)